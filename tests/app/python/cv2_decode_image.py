@@ -6,13 +6,17 @@ os.environ["VECLIB_MAXIMUM_THREADS"] = "1"
 os.environ["NUMEXPR_NUM_THREADS"] = "1"
 
 import numpy as np
-from urllib.request import urlopen
+import requests
 import cv2
 
+session = requests.Session()
+
 def url_to_image(url):
     # download the image, convert it to a numpy array, and then read
-    resp = urlopen(url)
-    image = np.asarray(bytearray(resp.read()), dtype="uint8")
+    resp = session.get(url, stream=True)
+    resp.raise_for_status()
+    buf = b''.join(resp.iter_content(65536))
+    image = np.frombuffer(buf, dtype="uint8")
     image = cv2.imdecode(image, cv2.IMREAD_COLOR)
     return image
 
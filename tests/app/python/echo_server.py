@@ -1,4 +1,3 @@
-from os import terminal_size
 import socket
 import sys
 
@@ -10,14 +9,17 @@ server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
 server.bind((sys.argv[1], 8080))
 server.listen(1)
 client, address = server.accept()
-print('Connection from', address)
+print('Connection from', address, flush=True)
 
+buf = bytearray(65536)
+mv = memoryview(buf)
+out = sys.stdout.buffer
 while True:
-  data = client.recv(1024)
-  str_data = data.decode()
-  if not data:
+  n = client.recv_into(mv)
+  if not n:
       break
-  print('Received from client', str_data, end='')
-  client.send(data)
+  out.write(b'Received from client ')
+  out.write(mv[:n])
+  client.sendall(mv[:n])
 
 client.close()
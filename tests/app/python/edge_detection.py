@@ -5,10 +5,9 @@ os.environ["MKL_NUM_THREADS"] = "1"
 os.environ["VECLIB_MAXIMUM_THREADS"] = "1"
 os.environ["NUMEXPR_NUM_THREADS"] = "1"
 
-import numpy as np
 import cv2
-from PIL import Image
 import binascii
+import sys
 
 
 def load_image(path):
@@ -16,22 +15,23 @@ def load_image(path):
     return image
 
 
-def canny(img, out_file):
+def canny(img):
     img_gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     img_blur = cv2.GaussianBlur(img_gray, (3,3), 0)
     canny = cv2.Canny(img_blur, 30, 150)
-    cv2.imwrite(out_file, canny)
+    ok, buf = cv2.imencode('.jpg', canny)
+    if not ok:
+        print('failed to encode canny result', file=sys.stderr)
+        exit(1)
+    return buf
 
 
-def dump_file_in_hex(file):
-    with open(file, 'rb') as f:
-        data = binascii.hexlify(f.read())
-        print(data)
+def dump_in_hex(data):
+    sys.stdout.buffer.write(binascii.hexlify(data) + b'\n')
 
 
 if __name__ == '__main__':
     cv2.setNumThreads(1)
     img = load_image("/home/timmy.webp")
-    out_file = 'cv2result.jpg'
-    canny(img, out_file)
-    dump_file_in_hex(out_file)
+    jpg = canny(img)
+    dump_in_hex(jpg.tobytes())
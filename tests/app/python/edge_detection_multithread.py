@@ -1,29 +1,41 @@
-import numpy as np
 import cv2
-from PIL import Image
 import binascii
+import sys
 
 
-def load_image(path):
-    image = cv2.imread(path)
+def load_image(path, flags=cv2.IMREAD_COLOR):
+    image = cv2.imread(path, flags)
     return image
 
 
-def canny(img, out_file):
-    img_gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
-    img_blur = cv2.GaussianBlur(img_gray, (3,3), 0)
-    canny = cv2.Canny(img_blur, 30, 150)
-    cv2.imwrite(out_file, canny)
+def canny(img_gray):
+    if cv2.cuda.getCudaEnabledDeviceCount() > 0:
+        canny = canny_cuda(img_gray)
+    else:
+        img_blur = cv2.GaussianBlur(img_gray, (3,3), 0)
+        canny = cv2.Canny(img_blur, 30, 150)
+    ok, buf = cv2.imencode('.jpg', canny)
+    if not ok:
+        print('failed to encode canny result', file=sys.stderr)
+        exit(1)
+    return buf
 
 
-def dump_file_in_hex(file):
-    with open(file, 'rb') as f:
-        data = binascii.hexlify(f.read())
-        print(data)
+def canny_cuda(img_gray):
+    gpu_img = cv2.cuda_GpuMat()
+    gpu_img.upload(img_gray)
+    gaussian = cv2.cuda.createGaussianFilter(
+        cv2.CV_8UC1, cv2.CV_8UC1, (3,3), 0)
+    gpu_blur = gaussian.apply(gpu_img)
+    detector = cv2.cuda.createCannyEdgeDetector(30, 150)
+    return detector.detect(gpu_blur).download()
+
+
+def dump_in_hex(data):
+    sys.stdout.buffer.write(binascii.hexlify(data) + b'\n')
 
 
 if __name__ == '__main__':
-    img = load_image("/home/timmy.webp")
-    out_file = 'cv2result.jpg'
-    canny(img, out_file)
-    dump_file_in_hex(out_file)
+    img = load_image("/home/timmy.webp", cv2.IMREAD_GRAYSCALE)
+    jpg = canny(img)
+    dump_in_hex(jpg.tobytes())
@@ -4,9 +4,11 @@ from PIL import Image
 
 URL = "https://i.imgur.com/ExdKOOz.png"
 
+session = requests.Session()
+
 
 if __name__ == '__main__':
-    response = requests.get(URL)
+    response = session.get(URL)
     print('downloaded')
     content = BytesIO(response.content)
     img = Image.open(content)
@@ -1,9 +1,11 @@
 import os
-os.environ["OMP_NUM_THREADS"] = "1"
-os.environ["OPENBLAS_NUM_THREADS"] = "1"
-os.environ["MKL_NUM_THREADS"] = "1"
-os.environ["VECLIB_MAXIMUM_THREADS"] = "1"
-os.environ["NUMEXPR_NUM_THREADS"] = "1"
+# Single-threaded by default (see matmul_multithread.py for the multi-core
+# variant). Set any of these in the environment to let BLAS use more cores.
+os.environ.setdefault("OMP_NUM_THREADS", "1")
+os.environ.setdefault("OPENBLAS_NUM_THREADS", "1")
+os.environ.setdefault("MKL_NUM_THREADS", "1")
+os.environ.setdefault("VECLIB_MAXIMUM_THREADS", "1")
+os.environ.setdefault("NUMEXPR_NUM_THREADS", "1")
 
 import numpy as np
 
@@ -12,6 +14,14 @@ np.random.seed(0)
 size = 1024
 A, B = np.random.random((size, size)), np.random.random((size, size))
 
-C = np.dot(A, B)
+# Blocked GEMM loop: the product is split into 256x256 @ 256x512 block
+# products, each handed to BLAS and accumulated into C. The blocks are not
+# sized to fit any cache; BLAS does its own packing inside each call.
+MC, KC, NC = 256, 256, 512
+C = np.zeros((size, size))
+for i in range(0, size, MC):
+    for k in range(0, size, KC):
+        for j in range(0, size, NC):
+            C[i:i+MC, j:j+NC] += A[i:i+MC, k:k+KC] @ B[k:k+KC, j:j+NC]
 print(A.shape, B.shape, C.shape)
 print('matmul result:', A)
@@ -1,24 +1,30 @@
 # cf) https://github.com/tensorflow/tensorflow/blob/master/tensorflow/lite/examples/python/label_image.py
-from PIL import Image
+import functools
+import os
+import sys
 
+import cv2
 import numpy as np
 import tflite_runtime.interpreter as tflite
 
 
 def load_image(path, width, height):
-    return Image.open(path).resize((width, height))
+    img = cv2.imread(path, cv2.IMREAD_COLOR)
+    img = cv2.resize(img, (width, height), interpolation=cv2.INTER_LINEAR)
+    return cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
 
 
+@functools.lru_cache(maxsize=1)
 def load_labels(filename):
     with open(filename, 'r') as f:
-        return [line.strip() for line in f.readlines()]
+        return tuple(line.rstrip() for line in f)
 
 
 if __name__ == '__main__':
     mobilenet_tflite_path = '/home/mobilenet_v2_1.0_224_quant.tflite'
     interpreter = tflite.Interpreter(
         model_path=mobilenet_tflite_path,
-        num_threads=4,
+        num_threads=len(os.sched_getaffinity(0)),
     )
     interpreter.allocate_tensors()
     input_details = interpreter.get_input_details()
@@ -30,16 +36,33 @@ if __name__ == '__main__':
     width = input_details[0]['shape'][2]
 
     img = load_image('/home/grace_hopper.bmp', width, height)
-    input_data = np.expand_dims(img, axis=0)
 
     if floating_model:
-        input_data = (np.float32(input_data) - 127.5) / 127.5
+        # (x - 127.5) / 127.5 == x * (1 / 127.5) - 1, fused with the cast
+        pixels = cv2.addWeighted(
+            img, 1.0 / 127.5, img, 0.0, -1.0, dtype=cv2.CV_32F)
+    else:
+        # fully integer-quantized model: feed raw pixels, no normalization
+        scale, zero_point = input_details[0]['quantization']
+        if scale == 0:
+            print('model input is not quantized', file=sys.stderr)
+            exit(1)
+        pixels = img
+        if input_details[0]['dtype'] == np.int8:
+            if zero_point != -128:
+                print(f'unsupported int8 input zero point {zero_point}',
+                      file=sys.stderr)
+                exit(1)
+            # uint8 pixel p maps to int8 p - 128
+            pixels = (img ^ 0x80).view(np.int8)
+    input_data = pixels[None, ...]
 
     interpreter.set_tensor(input_details[0]['index'], input_data)
     interpreter.invoke()
     output_data = interpreter.get_tensor(output_details[0]['index'])
     results = np.squeeze(output_data)
-    top_k = results.argsort()[-5:][::-1]
+    top_k = np.argpartition(results, -5)[-5:]
+    top_k = top_k[np.argsort(results[top_k])[::-1]]
     labels = load_labels('/home/imagenet_labels.txt')
     for i in top_k:
         if floating_model:
@@ -1,14 +1,28 @@
+import io
 import tarfile
 import os
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import docker
 
 
+print_lock = threading.Lock()
+# sentinel attaches every container to the single tap100 device with a
+# fixed IP/MAC, so only one sentinel container can run at a time.
+sentinel_lock = threading.Lock()
+
+
+def log(*args, **kwargs):
+    with print_lock:
+        print(*args, **kwargs)
+
+
 def prelude():
     code = os.system('cargo +nightly b')
     if code != 0:
-        print('cargo +nightly build failed', file=sys.stderr)
+        log('cargo +nightly build failed', file=sys.stderr)
         return False
     return True
 
@@ -16,32 +30,31 @@ def prelude():
 def create_new_image(client, image_name, base_image, src, dst):
     container_name = image_name
     container = client.containers.create(base_image, name=container_name)
-    tar_name = 'test.tar'
-    with tarfile.open(tar_name, 'w') as tar:
+    buf = io.BytesIO()
+    with tarfile.open(fileobj=buf, mode='w') as tar:
         tar.add(src)
 
-    with open(tar_name, 'rb') as f:
-        ok = container.put_archive(path='/', data=f)
-        if not ok:
-            container.remove()
-            os.remove(tar_name)
-            print('put_archive failed', file=sys.stderr)
-            return False
+    ok = container.put_archive(path='/', data=buf.getvalue())
+    if not ok:
+        container.remove()
+        log(f'put_archive failed for {image_name}', file=sys.stderr)
+        return False
 
     container.commit(image_name)
     container.remove()
-    os.remove(tar_name)
     return True
 
 
 def test_stdout(client, image_name, command, test_name):
-    print(f'\nTesting {test_name} on image {image_name}')
+    log(f'\nTesting {test_name} on image {image_name}')
 
     try:
-        sentinel_stdout = client.containers.run(
-            image_name, command, auto_remove=True, runtime='sentinel-debug')
+        with sentinel_lock:
+            sentinel_stdout = client.containers.run(
+                image_name, command, auto_remove=True,
+                runtime='sentinel-debug')
     except docker.errors.ContainerError:
-        print(
+        log(
             f'sentinel failed to run {image_name} with command {command}',
             file=sys.stderr)
         return False
@@ -50,16 +63,18 @@ def test_stdout(client, image_name, command, test_name):
         runc_stdout = client.containers.run(
             image_name, command, auto_remove=True)
     except docker.errors.ContainerError:
-        print(
+        log(
             f'runc failed to run {image_name} with command {command}',
             file=sys.stderr)
         return False
 
     if sentinel_stdout == runc_stdout:
-        print('\t\033[92m\033[1mOK\033[00m', test_name)
+        log('\t\033[92m\033[1mOK\033[00m', test_name)
         return True
     else:
-        print('sentinel and runc have different output', file=sys.stderr)
+        log(
+            f'{test_name}: sentinel and runc have different output',
+            file=sys.stderr)
         return False
 
 
@@ -81,13 +96,14 @@ def test_simple_binaries(client, bin_name, command):
         f'/{bin_name}',
     ):
         teardown(None, bin_name)
-        exit(1)
+        return False
 
     if not test_stdout(client, image_name, command, image_name):
         teardown(image_name, bin_name)
-        exit(1)
+        return False
 
     teardown(image_name, bin_name)
+    return True
 
 
 class Language:
@@ -99,13 +115,12 @@ class Language:
 def test_interpreter_programs(client, prog_name, lang):
     prog = f'/root/{prog_name}.{lang.ext}'
 
-    if not test_stdout(
+    return test_stdout(
         client,
         f'sentinel-{lang.name}-test:debug',
         f'{lang.name} {prog}',
         f'{lang.name} {prog}',
-    ):
-        exit(1)
+    )
 
 
 if __name__ == '__main__':
@@ -116,17 +131,25 @@ if __name__ == '__main__':
     if not test_stdout(client, 'hello-world', '/hello', 'hello-world'):
         exit(1)
 
-    test_simple_binaries(client, 'hello_world', '/hello_world')
-    test_simple_binaries(client, 'echo', '/echo And in the end, \
-        the love you take is equal to the love you make')
-    # test_simple_binaries(client, 'open', '')
-
     python = Language('python', 'py')
     ruby = Language('ruby', 'rb')
 
-    test_interpreter_programs(client, 'hello_world', python)
-    test_interpreter_programs(client, 'gen_thumbnail_from_url', python)
-    test_interpreter_programs(client, 'cv2_decode_image', python)
-    test_interpreter_programs(client, 'edge_detection', python)
-    test_interpreter_programs(client, 'mobilenet_tflite', python)
-    test_interpreter_programs(client, 'hello', ruby)
+    tests = [
+        (test_simple_binaries, (client, 'hello_world', '/hello_world')),
+        (test_simple_binaries, (client, 'echo', '/echo And in the end, \
+        the love you take is equal to the love you make')),
+        # (test_simple_binaries, (client, 'open', '')),
+        (test_interpreter_programs, (client, 'hello_world', python)),
+        (test_interpreter_programs,
+            (client, 'gen_thumbnail_from_url', python)),
+        (test_interpreter_programs, (client, 'cv2_decode_image', python)),
+        (test_interpreter_programs, (client, 'edge_detection', python)),
+        (test_interpreter_programs, (client, 'mobilenet_tflite', python)),
+        (test_interpreter_programs, (client, 'hello', ruby)),
+    ]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda test: test[0](*test[1]), tests))
+
+    if not all(results):
+        exit(1)